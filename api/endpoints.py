@@ -1,38 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import traceback
 from datetime import datetime
+from typing import Literal
 
-from models import HabitEntry, HabitResponse, FeedbackResponse, ErrorResponse
-from database import get_db_dependency, HabitDB
+from models import HabitEntry, HabitResponse, FeedbackResponse, ErrorResponse, SimulationRequest, SimulationResponse, SyncResponse
+from database import get_db, get_db_dependency, get_data_version, bump_data_version, HabitDB
 from services.feedback_service import generate_feedback
-from services.chart_service import plot_habit_over_time
+from services.chart_service import plot_habit_chart, CHART_MEDIA_TYPES
+from services.simulation_service import simulate_scenarios
+from services.sync_service import build_sync
 from utils.error_handlers import AppException
+from utils.static_assets import get_index_html, negotiate_asset, IMMUTABLE_CACHE_CONTROL
 
 router = APIRouter()
 
 @router.get("/")
 async def read_root():
     try:
-        return FileResponse("static/index.html")
+        html = get_index_html()
+        if html is None:
+            return FileResponse("static/index.html")
+        # The page itself must be revalidated so it can point at new asset hashes
+        return HTMLResponse(html, headers={"Cache-Control": "no-cache"})
     except Exception as e:
         raise AppException(f"Failed to load main page: {str(e)}", 500)
+
+@router.get("/assets/{name}")
+async def static_asset(name: str, request: Request):
+    asset = negotiate_asset(name, request.headers.get("accept-encoding", ""))
+    if asset is None:
+        raise AppException(f"Asset not found: {name}", 404)
+
+    body, media_type, encoding = asset
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=media_type, headers=headers)
     
 @router.post("/add_entry", response_model=FeedbackResponse)
 async def add_entry(entry: HabitEntry, db: Session = Depends(get_db_dependency)):
     try:
+        version = bump_data_version(db)
         habit = HabitDB(
             sleep_hours=entry.sleep_hours,
             water_litres=entry.water_litres,
-            mood=entry.mood
+            mood=entry.mood,
+            version=version
         )
 
         db.add(habit)
         db.commit()
         db.refresh(habit)
 
-        feedback = generate_feedback(entry)
+        # Feedback predicts with the model for the new data version, which usually
+        # means a fresh training run; keep it off the event loop
+        feedback = await run_in_threadpool(generate_feedback, entry)
 
         return FeedbackResponse(
             message="Entry received successfully",
@@ -52,34 +77,80 @@ async def get_entries(db: Session = Depends(get_db_dependency)):
     except Exception as e:
         raise AppException(f"Failed to get entries: {str(e)}", 500)
     
+@router.post("/simulate", response_model=SimulationResponse)
+async def simulate(request: SimulationRequest):
+    try:
+        pairs = [(s.sleep_hours, s.water_litres) for s in request.scenarios] if request.scenarios else None
+        result = await run_in_threadpool(simulate_scenarios, request.sleep_hours, request.water_litres, pairs, request.horizon_days)
+        return SimulationResponse(**result)
+    except AppException:
+        raise
+    except Exception as e:
+        raise AppException(f"Failed to simulate scenarios: {str(e)}", 500)
+
+@router.get("/sync", response_model=SyncResponse)
+async def sync(since: int = Query(None, ge=0, description="Data version the client already has"),
+               include_data: bool = Query(True, description="Include entries, trends and forecast")):
+    try:
+        return SyncResponse(**await run_in_threadpool(build_sync, since, include_data))
+    except AppException:
+        raise
+    except Exception as e:
+        raise AppException(f"Failed to sync: {str(e)}", 500)
+
+ChartFormat = Literal['png', 'webp', 'svg']
+ChartSize = Literal['thumb', 'standard', 'full']
+
+def chart_response(buf, ok: bool, v, rendered_version: int, fmt: str) -> StreamingResponse:
+    headers = {}
+    # A versioned URL always renders the same chart, so the browser can keep it.
+    # Only promise that for a real chart, and if no entry was added while it rendered
+    if ok and v is not None and v == rendered_version == get_data_version():
+        headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    elif not ok:
+        headers["Cache-Control"] = "no-store"
+    return StreamingResponse(buf, media_type=CHART_MEDIA_TYPES[fmt], headers=headers)
+
 @router.get("/chart/sleep")
-async def chart_sleep(t: int = Query(None, description="Cache busting timestamp")):
+async def chart_sleep(t: int = Query(None, description="Cache busting timestamp"),
+                      v: int = Query(None, description="Data version the chart should reflect"),
+                      fmt: ChartFormat = Query('png', alias="format", description="Image format"),
+                      size: ChartSize = Query('full', description="Rendering preset: thumb, standard or full")):
     try:
-        buf = plot_habit_over_time('sleep_hours', 'Sleep Hours Over Time')
-        return StreamingResponse(buf, media_type='image/png')
+        version = get_data_version()
+        buf, ok = await run_in_threadpool(plot_habit_chart, 'sleep_hours', 'Sleep Hours Over Time', 3, fmt, size)
+        return chart_response(buf, ok, v, version, fmt)
     except Exception as e:
         raise AppException(f"Failed to generate sleep chart: {str(e)}", 500)
 
 @router.get("/chart/water")
-async def chart_water(t: int = Query(None, description="Cache busting timestamp")):
+async def chart_water(t: int = Query(None, description="Cache busting timestamp"),
+                      v: int = Query(None, description="Data version the chart should reflect"),
+                      fmt: ChartFormat = Query('png', alias="format", description="Image format"),
+                      size: ChartSize = Query('full', description="Rendering preset: thumb, standard or full")):
     try:
-        buf = plot_habit_over_time('water_litres', 'Water Intake Over Time')
-        return StreamingResponse(buf, media_type='image/png')
+        version = get_data_version()
+        buf, ok = await run_in_threadpool(plot_habit_chart, 'water_litres', 'Water Intake Over Time', 3, fmt, size)
+        return chart_response(buf, ok, v, version, fmt)
     except Exception as e:
         raise AppException(f"Failed to generate water chart: {str(e)}", 500)
 
 @router.get("/chart/mood")
-async def chart_mood(t: int = Query(None, description="Cache busting timestamp")):
+async def chart_mood(t: int = Query(None, description="Cache busting timestamp"),
+                     v: int = Query(None, description="Data version the chart should reflect"),
+                     fmt: ChartFormat = Query('png', alias="format", description="Image format"),
+                     size: ChartSize = Query('full', description="Rendering preset: thumb, standard or full")):
     try:
-        buf = plot_habit_over_time('mood', 'Mood Over Time')
-        return StreamingResponse(buf, media_type='image/png')
+        version = get_data_version()
+        buf, ok = await run_in_threadpool(plot_habit_chart, 'mood', 'Mood Over Time', 3, fmt, size)
+        return chart_response(buf, ok, v, version, fmt)
     except Exception as e:
         raise AppException(f"Failed to generate mood chart: {str(e)}", 500)
     
 @router.get("/health")
 async def health_check():
     try:
-        with get_db_dependency() as db:
+        with get_db() as db:
             count = db.query(HabitDB).count()
 
         return{
@@ -1,23 +1,68 @@
+import json
 import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent
 
-DATABASE_URL = "sqlite:///habits.db"
+DATABASE_URL = os.getenv("PULSE_DATABASE_URL", "sqlite:///habits.db")
 
 CHART_WIDTH = 14
 CHART_HEIGHT = 7
 CHART_DPI = 120
 
+# Rendering presets per requested chart size. Smaller sizes use fewer pixels,
+# thinner strokes and skip the extra layout pass of bbox_inches='tight'
+CHART_PRESETS = {
+    "thumb": {"width": 6, "height": 3, "dpi": 80, "linewidth": 1.2, "markersize": 3,
+              "title_size": 11, "title_pad": 6, "label_size": 8, "legend_size": 7, "tight": False},
+    "standard": {"width": 10, "height": 5, "dpi": 100, "linewidth": 1.6, "markersize": 5,
+                 "title_size": 14, "title_pad": 12, "label_size": 11, "legend_size": 10, "tight": False},
+    "full": {"width": CHART_WIDTH, "height": CHART_HEIGHT, "dpi": CHART_DPI, "linewidth": 2, "markersize": 8,
+             "title_size": 18, "title_pad": 20, "label_size": 14, "legend_size": 12, "tight": True},
+}
+CHART_DEFAULT_SIZE = "full"
+CHART_DEFAULT_FORMAT = "png"
+CHART_WEBP_QUALITY = 80
+
+# (format, size) variants the trainer pre-renders; keep in step with chartVariant() in static/app.js
+PRERENDER_CHART_VARIANTS = [("webp", "thumb"), ("webp", "standard"), ("webp", "full")]
+
 MODEL_WINDOW_SIZE = 3
 RF_ESTIMATORS = 100
+RF_MAX_DEPTH = 10
+RF_MIN_SAMPLES_SPLIT = 5
 RF_RANDOM_STATE = 42
 
+# Written by tools/tune_model.py; overrides the defaults above when present
+MODEL_PARAMS_PATH = BASE_DIR / "model_params.json"
+if MODEL_PARAMS_PATH.exists():
+    _tuned = json.loads(MODEL_PARAMS_PATH.read_text())
+    RF_ESTIMATORS = _tuned.get("n_estimators", RF_ESTIMATORS)
+    RF_MAX_DEPTH = _tuned.get("max_depth", RF_MAX_DEPTH)
+    RF_MIN_SAMPLES_SPLIT = _tuned.get("min_samples_split", RF_MIN_SAMPLES_SPLIT)
+
 FEEDBACK_DAYS_AHEAD = 2
 
+SIMULATION_MAX_SCENARIOS = 10000
+SIMULATION_MAX_AXIS_VALUES = 1000
+SIMULATION_MAX_HORIZON = 30
+
+CACHE_DIR = Path(os.getenv("PULSE_CACHE_DIR", BASE_DIR / ".cache"))
+WEB_WORKERS = int(os.getenv("PULSE_WORKERS", "1"))
+TRAINER_POLL_SECONDS = 2
+
 SLEEP_MIN = 0
 SLEEP_MAX = 24
 WATER_MIN = 0
 WATER_MAX = 10
 MOOD_MIN = 1
-MOOD_MAX = 5
\ No newline at end of file
+MOOD_MAX = 5
+
+STATIC_DIR = BASE_DIR / "static"
+FINGERPRINTED_ASSETS = ["app.js", "style.css"]
+ASSET_URL_PREFIX = "/assets"
+COMPRESSED_JSON_PATHS = ["/entries", "/sync", "/simulate", "/debug"]
+COMPRESSION_MIN_SIZE = 1000
+
+LOAD_TEST_BUDGET_PATH = BASE_DIR / "tools" / "latency_budget.json"
+LOAD_TEST_BUDGET_HEADROOM = 1.5
\ No newline at end of file
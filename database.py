@@ -1,11 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, Float, DateTime
+from sqlalchemy import create_engine, inspect, text, Column, Integer, Float, DateTime, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 from contextlib import contextmanager
+import shutil
 import traceback
+import uuid
 
-from config import DATABASE_URL
+from config import DATABASE_URL, CACHE_DIR
 
 engine = create_engine(DATABASE_URL, echo=False)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
@@ -18,15 +20,54 @@ class HabitDB(Base):
     water_litres = Column(Float)
     mood = Column(Integer)
     timestamp = Column(DateTime, default=datetime.utcnow)
+    version = Column(Integer, index=True)
+
+class DataVersionDB(Base):
+    __tablename__ = "data_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    # Random per database: a recreated habits.db restarts its version at 0, and
+    # the epoch keeps its cache entries apart from the old database's
+    epoch = Column(String(32))
+
+# Epoch of the database as of the last get_data_version() call
+_data_epoch = {"epoch": None}
 
 def init_db():
     try:
         Base.metadata.create_all(bind=engine)
+        migrate_db()
+        with get_db() as db:
+            row = db.query(DataVersionDB).filter(DataVersionDB.id == 1).first()
+            if row is None:
+                db.add(DataVersionDB(id=1, version=0, epoch=uuid.uuid4().hex))
+                db.commit()
+                # New database: nothing cached so far can belong to it
+                shutil.rmtree(CACHE_DIR, ignore_errors=True)
+            elif row.epoch is None:
+                row.epoch = uuid.uuid4().hex
+                db.commit()
         print("Database tables successfully created")
     except Exception as e:
         print(f"Error creating database tables: {e}")
         raise
 
+def migrate_db():
+    # create_all doesn't alter existing tables; rows from before the column
+    # existed keep a NULL version and are only returned by a full sync
+    columns = {c["name"] for c in inspect(engine).get_columns("habits")}
+    if "version" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE habits ADD COLUMN version INTEGER"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_habits_version ON habits (version)"))
+        print("Added version column to habits table")
+
+    columns = {c["name"] for c in inspect(engine).get_columns("data_version")}
+    if "epoch" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE data_version ADD COLUMN epoch VARCHAR(32)"))
+        print("Added epoch column to data_version table")
+
 @contextmanager
 def get_db():
     db = SessionLocal()
@@ -42,4 +83,29 @@ def get_db():
 
 def get_db_dependency():
     with get_db() as db:
-        yield db
\ No newline at end of file
+        yield db
+
+def bump_data_version(db) -> int:
+    # Single UPDATE so concurrent writers in other processes can't lose an increment
+    updated = db.query(DataVersionDB)\
+        .filter(DataVersionDB.id == 1)\
+        .update({DataVersionDB.version: DataVersionDB.version + 1})
+    if not updated:
+        db.add(DataVersionDB(id=1, version=1))
+        return 1
+    return db.query(DataVersionDB.version).filter(DataVersionDB.id == 1).scalar()
+
+def get_data_version(db=None) -> int:
+    if db is None:
+        with get_db() as db:
+            return get_data_version(db)
+    row = db.query(DataVersionDB).filter(DataVersionDB.id == 1).first()
+    if row is None:
+        return 0
+    _data_epoch["epoch"] = row.epoch
+    return row.version
+
+def get_data_epoch() -> str:
+    if _data_epoch["epoch"] is None:
+        get_data_version()
+    return _data_epoch["epoch"] or "default"
\ No newline at end of file
@@ -6,9 +6,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
+from config import COMPRESSED_JSON_PATHS, COMPRESSION_MIN_SIZE
 from database import init_db
 from api.endpoints import router
 from utils.error_handlers import register_error_handler
+from utils.static_assets import build_static_assets
+from utils.compression import JSONCompressionMiddleware
 
 os.makedirs("static", exist_ok=True)
 
@@ -25,6 +28,12 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+app.add_middleware(
+    JSONCompressionMiddleware,
+    paths=COMPRESSED_JSON_PATHS,
+    minimum_size=COMPRESSION_MIN_SIZE
+)
+
 register_error_handler(app)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -35,6 +44,7 @@ app.include_router(router)
 async def startup_event():
     print("Starting Pulse AI Coach")
     init_db()
+    build_static_assets()
     print("Application started successfully")
 
 @app.on_event("shutdown")
@@ -43,9 +53,27 @@ async def shutdown_event():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        reload=False,
-    )
\ No newline at end of file
+    from config import WEB_WORKERS
+
+    if WEB_WORKERS > 1:
+        import multiprocessing
+        from services.trainer_service import run_trainer
+
+        init_db()
+        trainer = multiprocessing.Process(target=run_trainer, name="pulse-trainer", daemon=True)
+        trainer.start()
+
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=WEB_WORKERS,
+            reload=False,
+        )
+    else:
+        uvicorn.run(
+            app,
+            host="0.0.0.0",
+            port=8000,
+            reload=False,
+        )
\ No newline at end of file
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Annotated, Optional
 from datetime import datetime
-from config import SLEEP_MIN, SLEEP_MAX, WATER_MIN, WATER_MAX, MOOD_MIN, MOOD_MAX
+from config import SLEEP_MIN, SLEEP_MAX, WATER_MIN, WATER_MAX, MOOD_MIN, MOOD_MAX, SIMULATION_MAX_HORIZON, SIMULATION_MAX_AXIS_VALUES, SIMULATION_MAX_SCENARIOS
 
 class HabitEntry(BaseModel):
     sleep_hours: float = Field(..., ge=SLEEP_MIN, le=SLEEP_MAX, description="Sleep duration in hours")
@@ -26,6 +26,7 @@ class HabitResponse(BaseModel):
     water_litres: float
     mood: int
     timestamp: Optional[datetime] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -34,6 +35,53 @@ class FeedbackResponse(BaseModel):
     message: str
     feedback: list[str]
 
+class Scenario(BaseModel):
+    sleep_hours: float = Field(..., ge=SLEEP_MIN, le=SLEEP_MAX, description="Hypothetical sleep duration in hours")
+    water_litres: float = Field(..., ge=WATER_MIN, le=WATER_MAX, description="Hypothetical water intake in litres")
+
+SleepHours = Annotated[float, Field(ge=SLEEP_MIN, le=SLEEP_MAX)]
+WaterLitres = Annotated[float, Field(ge=WATER_MIN, le=WATER_MAX)]
+
+class SimulationRequest(BaseModel):
+    sleep_hours: list[SleepHours] = Field(default_factory=list, max_length=SIMULATION_MAX_AXIS_VALUES,
+                                          description="Sleep values for a grid of scenarios")
+    water_litres: list[WaterLitres] = Field(default_factory=list, max_length=SIMULATION_MAX_AXIS_VALUES,
+                                            description="Water values for a grid of scenarios")
+    scenarios: Optional[list[Scenario]] = Field(None, max_length=SIMULATION_MAX_SCENARIOS,
+                                                description="Explicit scenarios, used instead of the grid")
+    horizon_days: int = Field(0, ge=0, le=SIMULATION_MAX_HORIZON, description="Days the habits are kept up before predicting")
+
+class ScenarioPrediction(BaseModel):
+    sleep_hours: float
+    water_litres: float
+    predicted_mood: float
+
+class SimulationResponse(BaseModel):
+    horizon_days: int
+    data_version: int
+    scenarios: list[ScenarioPrediction]
+    surface: Optional[list[list[float]]] = None
+
+class ForecastPoint(BaseModel):
+    timestamp: datetime
+    value: float
+
+class ChartStatus(BaseModel):
+    changed: bool
+    url: str
+
+class SyncResponse(BaseModel):
+    version: int
+    since: Optional[int] = None
+    full: bool
+    changed: bool
+    entries: list[HabitResponse]
+    added: int
+    entries_count: int
+    trends: Optional[dict[str, float]] = None
+    forecast: Optional[dict[str, list[ForecastPoint]]] = None
+    charts: dict[str, ChartStatus]
+
 class ErrorResponse(BaseModel):
     error: str
     details: Optional[str] = None
@@ -1,4 +1,8 @@
+from . import cache_service
 from . import data_service
 from . import ml_service
 from . import chart_service
-from . import feedback_service
\ No newline at end of file
+from . import feedback_service
+from . import simulation_service
+from . import sync_service
+from . import trainer_service
\ No newline at end of file
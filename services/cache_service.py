@@ -0,0 +1,79 @@
+import os
+import pickle
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from config import CACHE_DIR
+
+# Entries are shared between worker processes through CACHE_DIR. Every entry is
+# stored under the data version it was computed from, so a new entry in SQLite
+# invalidates it for every process at once without any messaging. Entries are
+# grouped by database epoch so a recreated database never reuses them.
+
+def _current_epoch() -> str:
+    from database import get_data_epoch
+    return get_data_epoch()
+
+def _entry_dir() -> Path:
+    return CACHE_DIR / _current_epoch()
+
+def _entry_path(name: str, version: int) -> Path:
+    return _entry_dir() / f"{name}-v{version}.pkl"
+
+def get_cached(name: str, version: int) -> Optional[Any]:
+    path = _entry_path(name, version)
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error reading cache entry {path.name}: {e}")
+        return None
+
+def set_cached(name: str, version: int, value: Any):
+    try:
+        entry_dir = _entry_dir()
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=entry_dir, prefix=f".{name}-")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic rename: readers never see a partially written entry
+        os.replace(tmp_path, _entry_path(name, version))
+        _prune_old_versions(name, version)
+    except Exception as e:
+        print(f"Error writing cache entry {name}: {e}")
+
+def _prune_old_versions(name: str, version: int):
+    # Only older versions: a slow writer finishing a stale version must not
+    # delete an entry another process already published for a newer one
+    prefix = f"{name}-v"
+    for path in _entry_dir().glob(f"{prefix}*.pkl"):
+        try:
+            entry_version = int(path.stem[len(prefix):])
+        except ValueError:
+            continue
+        if entry_version < version:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+@contextmanager
+def cache_lock(name: str):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_DIR / f"{name}.lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,133 +1,163 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
 from io import BytesIO
-from datetime import timedelta
+import threading
+import zlib
 import traceback
 import pandas as pd
+from typing import Tuple
 
-from config import CHART_WIDTH, CHART_HEIGHT, CHART_DPI
-from services.data_service import load_habit_data, compute_trends
-from services.ml_service import get_trained_model
+from config import CHART_PRESETS, CHART_DEFAULT_SIZE, CHART_DEFAULT_FORMAT, CHART_WEBP_QUALITY
+from database import get_data_version
+from services.data_service import load_habit_data, load_trends
+from services.ml_service import get_trained_model, forecast_habit
+from services.cache_service import get_cached, set_cached
 from utils.error_handlers import ChartGenerationException
-
-def create_empty_chart(message: str = "No data available") -> BytesIO:
+from utils.single_flight import single_flight
+
+CHART_MEDIA_TYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml'
+}
+
+# pyplot keeps global figure state, so renders from threadpool threads take turns
+_render_lock = threading.Lock()
+
+def save_figure(fig, fmt: str, preset: dict) -> BytesIO:
+    buf = BytesIO()
+    kwargs = {'format': fmt}
+    if preset['tight']:
+        kwargs['bbox_inches'] = 'tight'
+    if fmt == 'webp':
+        kwargs['pil_kwargs'] = {'quality': CHART_WEBP_QUALITY}
+    fig.savefig(buf, **kwargs)
+    buf.seek(0)
+    plt.close(fig)
+    return buf
+
+def create_empty_chart(message: str = "No data available", fmt: str = CHART_DEFAULT_FORMAT,
+                       size: str = CHART_DEFAULT_SIZE) -> BytesIO:
+    with _render_lock:
+        return _create_empty_chart(message, fmt, size)
+
+def _create_empty_chart(message: str, fmt: str, size: str) -> BytesIO:
     try:
-        buf = BytesIO()
-        fig, ax = plt.subplots(figsize=(10,6))
+        preset = CHART_PRESETS[size]
+        fig, ax = plt.subplots(figsize=(preset['width'], preset['height']), dpi=preset['dpi'])
 
         ax.text(0.5, 0.5, message,
-                ha='center', va='center', fontsize=16,
+                ha='center', va='center', fontsize=preset['title_size'],
                 transform=ax.transAxes, wrap=True)
         ax.axis('off')
 
         fig.tight_layout()
-        fig.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        plt.close(fig)
-        return buf
+        return save_figure(fig, fmt, preset)
     
     except Exception as e:
         raise ChartGenerationException(f"Failed to create empty chart: {str(e)}")
     
-def plot_habit_over_time(habit_column: str, title: str, days_ahead: int = 3) -> BytesIO:
+def plot_habit_over_time(habit_column: str, title: str, days_ahead: int = 3,
+                         fmt: str = CHART_DEFAULT_FORMAT, size: str = CHART_DEFAULT_SIZE) -> BytesIO:
+    buf, _ = plot_habit_chart(habit_column, title, days_ahead, fmt, size)
+    return buf
+
+def plot_habit_chart(habit_column: str, title: str, days_ahead: int = 3,
+                     fmt: str = CHART_DEFAULT_FORMAT, size: str = CHART_DEFAULT_SIZE) -> Tuple[BytesIO, bool]:
+    # Returns the image and whether it is the real chart rather than an error placeholder
     try:
-        df = load_habit_data()
-        
-        if df.empty or len(df) < 2:
-            return create_empty_chart("Not enough data yet\nAdd more entries to see charts")
-        
-        df = df.sort_values('timestamp')
-
-        sns.set(style='whitegrid')
-
-        fig, ax = plt.subplots(figsize=(CHART_WIDTH, CHART_HEIGHT), dpi=CHART_DPI)
-
-        ax.plot(df['timestamp'], df[habit_column],
-                marker='o', linewidth=2, markersize=8,
-                label='Actual', color='#2196F3')
-        
-        if habit_column == "mood":
-            model_data = get_trained_model()
-            if model_data:
-                model, feature_cols = model_data
-                trends = compute_trends(df)
-
-                future_dates = []
-                future_preds = []
-                last_row = df.iloc[-1]
-
-                for i in range(1, days_ahead+1):
-                    features = {
-                        'sleep_hours': last_row['sleep_hours'] + trends['sleep_hours'] * i,
-                        'water_litres': last_row['water_litres'] + trends['water_litres'] * i,
-                        'sleep_slope': trends['sleep_hours'],
-                        'water_slope': trends['water_litres'],
-                        'mood_slope': trends['mood'],
-                        'avg_sleep': df['sleep_hours'].rolling(3).mean().iloc[-1],
-                        'avg_water': df['water_litres'].rolling(3).mean().iloc[-1],
-                        'avg_mood': df['mood'].rolling(3).mean().iloc[-1]
-                    }
-
-                    features_df = pd.DataFrame([features])
-                    if all(col in features_df.columns for col in feature_cols):
-                        prediction = model.predict(features_df[feature_cols])[0]
-                        future_preds.append(prediction)
-                        future_dates.append(last_row['timestamp'] + timedelta(days=i))
-                
-                if future_preds:
-                    ax.plot(future_dates, future_preds,
-                            linestyle='--', marker='s', linewidth=2,
-                            markersize=8, label='AI Prediction', color='#4CAF50')
-        else:
-            trends = compute_trends(df)
-            last_value = df[habit_column].iloc[-1]
-            slope = trends.get(habit_column, 0)
-
-            future_dates = [df['timestamp'].iloc[-1] + timedelta(days=i)
-                            for i in range(1, days_ahead+1)]
-            future_values = [last_value + slope * i
-                             for i in range(1, days_ahead+1)]
-            
-            ax.plot(future_dates, future_values,
-                    linestyle='--', marker='^', linewidth=2,
-                    markersize=8, label='Trend Projection', color='#FF9800')
-            
-        ax.set_title(title, fontsize=18, pad=20, fontweight='bold')
-        ax.set_xlabel("Date", fontsize=14)
-        ax.set_ylabel(habit_column.replace('_', ' ').title(), fontsize=14)
+        # Read the version before the data so a concurrent write can only make the
+        # cached chart look older than it is, never newer
+        version = get_data_version()
+        cache_name = f"chart_{habit_column}_{days_ahead}_{size}_{fmt}_{zlib.crc32(title.encode()):08x}"
+        data = single_flight.do((cache_name, version), _chart_bytes,
+                                habit_column, title, days_ahead, fmt, size, cache_name, version)
+        return BytesIO(data), True
 
-        all_values = list(df[habit_column])
-        if 'future_values' in locals():
-            all_values.extend(future_values)
+    except Exception as e:
+        print(f"Error creating chart for {habit_column}: {e}")
+        print(traceback.format_exc())
+        return create_empty_chart(f"Error generating chart\n{str(e)[:50]}", fmt, size), False
 
-        y_min = min(all_values) * 0.9 if min(all_values) > 0 else min(all_values) - 0.5
-        y_max = max(all_values) * 1.1
+def _chart_bytes(habit_column: str, title: str, days_ahead: int, fmt: str, size: str,
+                 cache_name: str, version: int) -> bytes:
+    cached = get_cached(cache_name, version)
+    if cached is not None:
+        return cached
 
-        ax.set_ylim(y_min, y_max)    
-        ax.legend(fontsize=12)
-        ax.grid(True, alpha=0.3)
+    df = load_habit_data()
 
-        fig.autofmt_xdate()
-        fig.tight_layout()
+    if df.empty or len(df) < 2:
+        return create_empty_chart("Not enough data yet\nAdd more entries to see charts", fmt, size).getvalue()
 
-        buf = BytesIO()
-        fig.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        plt.close(fig)
+    data = render_habit_chart(df, habit_column, title, days_ahead, version, fmt, size).getvalue()
+    set_cached(cache_name, version, data)
+    return data
 
-        return buf
+def render_habit_chart(df: pd.DataFrame, habit_column: str, title: str, days_ahead: int, version: int,
+                       fmt: str = CHART_DEFAULT_FORMAT, size: str = CHART_DEFAULT_SIZE) -> BytesIO:
+    df = df.sort_values('timestamp')
 
-    except Exception as e:
-        print(f"Error creating chart for {habit_column}: {e}")
-        print(traceback.format_exc())
-        return create_empty_chart(f"Error generating chart\n{str(e)[:50]}")
+    # Train/predict before taking the render lock so only drawing holds it
+    model_data = get_trained_model() if habit_column == "mood" else None
+    trends = load_trends(df, version)
+    future_dates, future_values = forecast_habit(df, habit_column, days_ahead, model_data, trends)
+
+    with _render_lock:
+        return draw_habit_chart(df, habit_column, title, future_dates, future_values, fmt, size)
+
+def draw_habit_chart(df: pd.DataFrame, habit_column: str, title: str, future_dates: list, future_values: list,
+                     fmt: str = CHART_DEFAULT_FORMAT, size: str = CHART_DEFAULT_SIZE) -> BytesIO:
+    preset = CHART_PRESETS[size]
+    fig = build_habit_figure(df, habit_column, title, future_dates, future_values, preset)
+    return save_figure(fig, fmt, preset)
+
+def build_habit_figure(df: pd.DataFrame, habit_column: str, title: str, future_dates: list,
+                       future_values: list, preset: dict):
+    sns.set(style='whitegrid')
+
+    fig, ax = plt.subplots(figsize=(preset['width'], preset['height']), dpi=preset['dpi'])
+
+    ax.plot(df['timestamp'], df[habit_column],
+            marker='o', linewidth=preset['linewidth'], markersize=preset['markersize'],
+            label='Actual', color='#2196F3')
+
+    if habit_column == "mood":
+        if future_values:
+            ax.plot(future_dates, future_values,
+                    linestyle='--', marker='s', linewidth=preset['linewidth'],
+                    markersize=preset['markersize'], label='AI Prediction', color='#4CAF50')
+    else:
+        ax.plot(future_dates, future_values,
+                linestyle='--', marker='^', linewidth=preset['linewidth'],
+                markersize=preset['markersize'], label='Trend Projection', color='#FF9800')
+
+    ax.set_title(title, fontsize=preset['title_size'], pad=preset['title_pad'], fontweight='bold')
+    ax.set_xlabel("Date", fontsize=preset['label_size'])
+    ax.set_ylabel(habit_column.replace('_', ' ').title(), fontsize=preset['label_size'])
+
+    all_values = list(df[habit_column])
+    if habit_column != "mood":
+        all_values.extend(future_values)
+
+    y_min = min(all_values) * 0.9 if min(all_values) > 0 else min(all_values) - 0.5
+    y_max = max(all_values) * 1.1
+
+    ax.set_ylim(y_min, y_max)    
+    ax.legend(fontsize=preset['legend_size'])
+    ax.grid(True, alpha=0.3)
+
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+    return fig
     
-def plot_all_charts() -> dict:
+def plot_all_charts(fmt: str = CHART_DEFAULT_FORMAT, size: str = CHART_DEFAULT_SIZE) -> dict:
     try:
         charts = {
-            'sleep': plot_habit_over_time('sleep_hours', 'Sleep Hours Over Time'),
-            'water': plot_habit_over_time('water_litres', 'Water Intake Over Time'),
-            'mood': plot_habit_over_time('mood', 'Mood Over Time')
+            'sleep': plot_habit_over_time('sleep_hours', 'Sleep Hours Over Time', 3, fmt, size),
+            'water': plot_habit_over_time('water_litres', 'Water Intake Over Time', 3, fmt, size),
+            'mood': plot_habit_over_time('mood', 'Mood Over Time', 3, fmt, size)
         }
 
         return charts
@@ -4,27 +4,35 @@ from typing import Dict, List, Optional, Tuple
 import traceback
 from datetime import datetime, timedelta
 
-from database import get_db, HabitDB
+from database import get_db, get_data_version, HabitDB
+from services.cache_service import get_cached, set_cached
 from utils.error_handlers import DatabaseException
+from utils.single_flight import single_flight
 
 def load_habit_data():
     try:
-        with get_db() as db:
-            habits = db.query(HabitDB).all()
+        version = get_data_version()
+        df = single_flight.do(("habit_data", version), _query_habit_data)
+        # Waiters share one frame; hand each caller its own copy
+        return df.copy()
+    except Exception as e:
+        raise DatabaseException(f"Failed to load habit data: {str(e)}")
 
-        data = []
+def _query_habit_data() -> pd.DataFrame:
+    with get_db() as db:
+        habits = db.query(HabitDB).all()
 
-        for i in habits:
-            data.append({
-                "sleep_hours": i.sleep_hours,
-                "water_litres": i.water_litres,
-                "mood": i.mood,
-                "timestamp": i.timestamp
-            })
+    data = []
 
-        return pd.DataFrame(data)
-    except Exception as e:
-        raise DatabaseException(f"Failed to load habit data: {str(e)}")
+    for i in habits:
+        data.append({
+            "sleep_hours": i.sleep_hours,
+            "water_litres": i.water_litres,
+            "mood": i.mood,
+            "timestamp": i.timestamp
+        })
+
+    return pd.DataFrame(data)
     
 def compute_trends(df: pd.DataFrame, window: int = 3) -> Dict[str, float]:
     try:
@@ -55,6 +63,18 @@ def compute_trends(df: pd.DataFrame, window: int = 3) -> Dict[str, float]:
         print(f"Error computing trends: {e}")
         return {'sleep_hours': 0, 'water_litres': 0, 'mood': 0}
 
+def load_trends(df: pd.DataFrame, version: int) -> Dict[str, float]:
+    return dict(single_flight.do(("trends", version), _load_or_compute_trends, df, version))
+
+def _load_or_compute_trends(df: pd.DataFrame, version: int) -> Dict[str, float]:
+    cached = get_cached("trends", version)
+    if cached is not None:
+        return cached
+
+    trends = compute_trends(df)
+    set_cached("trends", version, trends)
+    return trends
+
 def safe_rolling_last(series: pd.Series, window: int) -> float:
     try:
         if len(series) == 0:
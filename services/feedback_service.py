@@ -2,7 +2,8 @@ from typing import List
 import pandas as pd
 
 from models import HabitEntry
-from services.data_service import load_habit_data, compute_trends, safe_rolling_last
+from database import get_data_version
+from services.data_service import load_habit_data, load_trends, safe_rolling_last
 from services.ml_service import predict_mood, get_feature_importance
 from config import FEEDBACK_DAYS_AHEAD
 
@@ -10,6 +11,7 @@ def generate_feedback(entry: HabitEntry, days_ahead: int = FEEDBACK_DAYS_AHEAD)
     feedback = []
 
     try:
+        version = get_data_version()
         df = load_habit_data()
         feedback.append("Great job on sleep!" if entry.sleep_hours >= 7 else "Try to sleep at least 7 hours")
         feedback.append("Good water intake!" if entry.water_litres >=2 else "Drink more water")
@@ -18,7 +20,7 @@ def generate_feedback(entry: HabitEntry, days_ahead: int = FEEDBACK_DAYS_AHEAD)
             feedback.append("Keep logging data to unlock AI predictions")
             return feedback
         
-        trends = compute_trends(df)
+        trends = load_trends(df, version)
 
         features = pd.DataFrame([{
                 'sleep_hours': entry.sleep_hours,
@@ -1,13 +1,46 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
-from typing import Optional, Tuple
-from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from datetime import timedelta
 import traceback
 
-from config import MODEL_WINDOW_SIZE, RF_ESTIMATORS, RF_RANDOM_STATE
+from config import MODEL_WINDOW_SIZE, RF_ESTIMATORS, RF_MAX_DEPTH, RF_MIN_SAMPLES_SPLIT, RF_RANDOM_STATE
+from database import get_data_version, get_data_epoch
 from services.data_service import load_habit_data, compute_trends, safe_rolling_last
+from services.cache_service import get_cached, set_cached, cache_lock
 from utils.error_handlers import ModelTrainingException
+from utils.single_flight import single_flight
+
+FEATURE_COLUMNS = ['sleep_hours', 'water_litres', 'sleep_slope', 'water_slope', 'mood_slope', 'avg_sleep', 'avg_water', 'avg_mood']
+
+def build_training_frame(df: pd.DataFrame, window: int = MODEL_WINDOW_SIZE,
+                         trends: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    df = df.sort_values("timestamp")
+
+    if trends is None:
+        trends = compute_trends(df, window=window)
+    df['sleep_slope'] = trends['sleep_hours']
+    df['water_slope'] = trends['water_litres']
+    df['mood_slope'] = trends['mood']
+
+    # Averages of the days before each row: avg_mood must not include the mood
+    # being predicted, and forecasts only know the averages of past days
+    df['avg_sleep'] = df['sleep_hours'].rolling(window).mean().shift(1)
+    df['avg_water'] = df['water_litres'].rolling(window).mean().shift(1)
+    df['avg_mood'] = df['mood'].rolling(window).mean().shift(1)
+
+    return df.dropna()
+
+def build_model(n_estimators: int = RF_ESTIMATORS, max_depth: Optional[int] = RF_MAX_DEPTH,
+                min_samples_split: int = RF_MIN_SAMPLES_SPLIT, n_jobs: Optional[int] = None) -> RandomForestRegressor:
+    return RandomForestRegressor(
+        n_estimators=n_estimators,
+        random_state=RF_RANDOM_STATE,
+        max_depth=max_depth,
+        min_samples_split=min_samples_split,
+        n_jobs=n_jobs
+    )
 
 def train_enhanced_mood_model(window: int = MODEL_WINDOW_SIZE) -> Optional[Tuple[RandomForestRegressor, list]]:
     try:
@@ -17,34 +50,18 @@ def train_enhanced_mood_model(window: int = MODEL_WINDOW_SIZE) -> Optional[Tuple
             print(f"Not enough data for training. Need {window} entries, have {len(df)}")
             return None
 
-        df = df.sort_values("timestamp")
-
-        trends = compute_trends(df, window=window)
-        df['sleep_slope'] = trends['sleep_hours']
-        df['water_slope'] = trends['water_litres']
-        df['mood_slope'] = trends['mood']
-
-        df['avg_sleep'] = df['sleep_hours'].rolling(window).mean()
-        df['avg_water'] = df['water_litres'].rolling(window).mean()
-        df['avg_mood'] = df['mood'].rolling(window).mean()
-
-        df = df.dropna()
+        df = build_training_frame(df, window)
 
         if len(df) == 0:
             print("No valid data after cleaning")
             return None
 
-        features = ['sleep_hours', 'water_litres', 'sleep_slope', 'water_slope', 'mood_slope', 'avg_sleep', 'avg_water', 'avg_mood']
+        features = list(FEATURE_COLUMNS)
 
         x = df[features]
         y = df['mood']
 
-        model = RandomForestRegressor(
-            n_estimators=RF_ESTIMATORS,
-            random_state=RF_RANDOM_STATE,
-            max_depth=10,
-            min_samples_split=5
-        )
+        model = build_model()
         model.fit(x, y)
 
         print(f"Model tranined successfully on {len(df)} samples")
@@ -52,14 +69,39 @@ def train_enhanced_mood_model(window: int = MODEL_WINDOW_SIZE) -> Optional[Tuple
     except Exception as e:
         raise ModelTrainingException(f"Failed to train mood model: {str(e)}")
 
-@lru_cache(maxsize=1)
+MODEL_CACHE_NAME = "mood_model"
+
+# ((epoch, data version), model data), swapped as one tuple so threads never see a mix
+_local_model = {"entry": None}
+
 def get_trained_model() -> Optional[Tuple[RandomForestRegressor, list]]:
     try:
-        return train_enhanced_mood_model()
+        version = get_data_version()
+        key = (get_data_epoch(), version)
+        entry = _local_model["entry"]
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        # Threads in this process coalesce here; other processes coalesce on the file lock
+        cached = single_flight.do((MODEL_CACHE_NAME, version), _load_or_train_model, version)
+
+        _local_model["entry"] = (key, cached["model_data"])
+        return cached["model_data"]
     except Exception as e:
         print(f"Error getting trained model: {e}")
         return None
     
+def _load_or_train_model(version: int) -> dict:
+    cached = get_cached(MODEL_CACHE_NAME, version)
+    if cached is None:
+        # Only one process trains a given data version; the rest wait and reuse it
+        with cache_lock(MODEL_CACHE_NAME):
+            cached = get_cached(MODEL_CACHE_NAME, version)
+            if cached is None:
+                cached = {"model_data": train_enhanced_mood_model()}
+                set_cached(MODEL_CACHE_NAME, version, cached)
+    return cached
+    
 def predict_mood(features_df: pd.DataFrame) -> Optional[float]:
     try:
         model_data = get_trained_model()
@@ -78,6 +120,60 @@ def predict_mood(features_df: pd.DataFrame) -> Optional[float]:
         print(f"Error predicting mood: {e}")
         return None
     
+def predict_mood_batch(features: np.ndarray) -> Optional[np.ndarray]:
+    try:
+        model_data = get_trained_model()
+        if not model_data:
+            return None
+
+        model, feature_cols = model_data
+        if features.ndim != 2 or features.shape[1] != len(feature_cols):
+            return None
+
+        # One predict call for the whole batch instead of one per scenario
+        frame = pd.DataFrame(features, columns=feature_cols)
+        return model.predict(frame)
+
+    except Exception as e:
+        print(f"Error predicting mood batch: {e}")
+        return None
+
+def forecast_habit(df: pd.DataFrame, habit_column: str, days_ahead: int,
+                   model_data: Optional[Tuple[RandomForestRegressor, list]],
+                   trends: Dict[str, float]) -> Tuple[List, List[float]]:
+    # Mood is forecast by the model; sleep and water follow their trend slope
+    df = df.sort_values('timestamp')
+    last_row = df.iloc[-1]
+    future_dates = [last_row['timestamp'] + timedelta(days=i) for i in range(1, days_ahead+1)]
+
+    if habit_column != "mood":
+        slope = trends.get(habit_column, 0)
+        return future_dates, [float(last_row[habit_column] + slope * i) for i in range(1, days_ahead+1)]
+
+    if not model_data:
+        return [], []
+
+    model, feature_cols = model_data
+    rows = []
+    for i in range(1, days_ahead+1):
+        rows.append({
+            'sleep_hours': last_row['sleep_hours'] + trends['sleep_hours'] * i,
+            'water_litres': last_row['water_litres'] + trends['water_litres'] * i,
+            'sleep_slope': trends['sleep_hours'],
+            'water_slope': trends['water_litres'],
+            'mood_slope': trends['mood'],
+            'avg_sleep': df['sleep_hours'].rolling(3).mean().iloc[-1],
+            'avg_water': df['water_litres'].rolling(3).mean().iloc[-1],
+            'avg_mood': df['mood'].rolling(3).mean().iloc[-1]
+        })
+
+    features_df = pd.DataFrame(rows)
+    if not all(col in features_df.columns for col in feature_cols):
+        return [], []
+
+    predictions = model.predict(features_df[feature_cols])
+    return future_dates, [float(p) for p in predictions]
+
 def get_feature_importance() -> Optional[pd.DataFrame]:
     try:
         model_data = get_trained_model()
@@ -0,0 +1,75 @@
+import numpy as np
+from typing import Dict, List, Optional
+
+from config import MODEL_WINDOW_SIZE, SIMULATION_MAX_SCENARIOS
+from database import get_data_version
+from services.data_service import load_habit_data, load_trends
+from services.ml_service import get_trained_model, predict_mood_batch
+from utils.error_handlers import AppException
+
+def build_scenario_features(sleep: np.ndarray, water: np.ndarray, history: Dict[str, np.ndarray],
+                            trends: Dict[str, float], feature_cols: List[str],
+                            horizon_days: int = 0, window: int = MODEL_WINDOW_SIZE) -> np.ndarray:
+    # After keeping a habit for k days the rolling average holds k scenario
+    # values and the last (window - k) real ones
+    k = min(horizon_days, window)
+    recent = window - k
+    sleep_history = history['sleep_hours'][-recent:].sum() if recent else 0.0
+    water_history = history['water_litres'][-recent:].sum() if recent else 0.0
+
+    columns = {
+        'sleep_hours': sleep,
+        'water_litres': water,
+        'sleep_slope': np.full(len(sleep), trends['sleep_hours']),
+        'water_slope': np.full(len(sleep), trends['water_litres']),
+        'mood_slope': np.full(len(sleep), trends['mood']),
+        'avg_sleep': (sleep_history + sleep * k) / window,
+        'avg_water': (water_history + water * k) / window,
+        'avg_mood': np.full(len(sleep), history['mood'][-window:].mean()),
+    }
+    return np.column_stack([columns[col] for col in feature_cols])
+
+def simulate_scenarios(sleep_values: List[float], water_values: List[float],
+                       pairs: Optional[List[tuple]] = None, horizon_days: int = 0) -> Dict:
+    # Check the size before allocating: a short JSON body can describe a huge grid
+    count = len(pairs) if pairs else len(sleep_values) * len(water_values)
+    if count > SIMULATION_MAX_SCENARIOS:
+        raise AppException(f"Too many scenarios: {count} (max {SIMULATION_MAX_SCENARIOS})", 400)
+
+    if pairs:
+        sleep = np.array([p[0] for p in pairs], dtype=float)
+        water = np.array([p[1] for p in pairs], dtype=float)
+        grid_shape = None
+    else:
+        if not sleep_values or not water_values:
+            raise AppException("Provide scenarios or both sleep_hours and water_litres values", 400)
+        sleep_grid, water_grid = np.meshgrid(np.asarray(sleep_values, dtype=float),
+                                             np.asarray(water_values, dtype=float), indexing='ij')
+        sleep, water = sleep_grid.ravel(), water_grid.ravel()
+        grid_shape = sleep_grid.shape
+
+    version = get_data_version()
+    df = load_habit_data()
+    model_data = get_trained_model()
+    if df.empty or len(df) < MODEL_WINDOW_SIZE or not model_data:
+        raise AppException("Not enough data to simulate yet. Keep logging entries", 400)
+
+    _, feature_cols = model_data
+    df = df.sort_values('timestamp')
+    history = {col: df[col].to_numpy(dtype=float) for col in ['sleep_hours', 'water_litres', 'mood']}
+    trends = load_trends(df, version)
+
+    features = build_scenario_features(sleep, water, history, trends, feature_cols, horizon_days)
+    predictions = predict_mood_batch(features)
+    if predictions is None:
+        raise AppException("Mood model could not score the scenarios", 500)
+
+    return {
+        "horizon_days": horizon_days,
+        "data_version": version,
+        "scenarios": [
+            {"sleep_hours": float(s), "water_litres": float(w), "predicted_mood": float(m)}
+            for s, w, m in zip(sleep, water, predictions)
+        ],
+        "surface": predictions.reshape(grid_shape).tolist() if grid_shape else None
+    }
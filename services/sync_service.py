@@ -0,0 +1,79 @@
+from typing import Dict, Optional
+from sqlalchemy import or_
+
+from database import get_db, get_data_version, HabitDB
+from services.data_service import load_habit_data, load_trends
+from services.ml_service import get_trained_model, forecast_habit
+from utils.error_handlers import DatabaseException
+
+CHART_COLUMNS = {
+    'sleep': 'sleep_hours',
+    'water': 'water_litres',
+    'mood': 'mood'
+}
+
+def build_sync(since: Optional[int] = None, include_data: bool = True, days_ahead: int = 3) -> Dict:
+    try:
+        with get_db() as db:
+            version = get_data_version(db)
+            # A client ahead of the server (e.g. after a database reset) starts over
+            full = since is None or since > version
+            changed = full or since < version
+
+            # Entries committed after `version` was read belong to the next sync;
+            # returning them now would send them twice
+            known = db.query(HabitDB).filter(or_(HabitDB.version <= version, HabitDB.version.is_(None)))
+            entries_count = known.count()
+            delta = known if full else known.filter(HabitDB.version > since)
+            entries = []
+            added = delta.count() if changed else 0
+            if changed and include_data:
+                entries = [
+                    {
+                        "id": entry.id,
+                        "sleep_hours": entry.sleep_hours,
+                        "water_litres": entry.water_litres,
+                        "mood": entry.mood,
+                        "timestamp": entry.timestamp,
+                        "version": entry.version
+                    }
+                    for entry in delta.order_by(HabitDB.timestamp.asc()).all()
+                ]
+    except Exception as e:
+        raise DatabaseException(f"Failed to load entries for sync: {str(e)}")
+
+    result = {
+        "version": version,
+        "since": since,
+        "full": full,
+        "changed": changed,
+        "entries": entries,
+        "added": added,
+        "entries_count": entries_count,
+        "trends": None,
+        "forecast": None,
+        "charts": {
+            name: {"changed": changed, "url": f"/chart/{name}?v={version}"}
+            for name in CHART_COLUMNS
+        }
+    }
+
+    # Clients that only refresh charts skip the trend/forecast work (and a
+    # possible model training run) they would throw away
+    if not changed or not include_data:
+        return result
+
+    df = load_habit_data()
+    trends = load_trends(df, version)
+    result["trends"] = {column: float(slope) for column, slope in trends.items()}
+
+    if len(df) >= 2:
+        model_data = get_trained_model()
+        forecast = {}
+        for name, column in CHART_COLUMNS.items():
+            dates, values = forecast_habit(df, column, days_ahead,
+                                           model_data if column == "mood" else None, trends)
+            forecast[name] = [{"timestamp": d, "value": v} for d, v in zip(dates, values)]
+        result["forecast"] = forecast
+
+    return result
@@ -0,0 +1,38 @@
+import time
+import traceback
+
+from config import TRAINER_POLL_SECONDS, PRERENDER_CHART_VARIANTS
+from database import engine, init_db, get_data_version
+from services.ml_service import get_trained_model
+from services.chart_service import plot_all_charts
+
+def publish_artifacts():
+    # Training and rendering go through the shared cache, so workers pick the
+    # results up for this data version instead of computing their own
+    get_trained_model()
+    for fmt, size in PRERENDER_CHART_VARIANTS:
+        plot_all_charts(fmt, size)
+
+def run_trainer(poll_interval: float = TRAINER_POLL_SECONDS):
+    # Forked after the parent ran init_db: drop the inherited pooled SQLite
+    # connections so this process opens its own
+    engine.dispose()
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    init_db()
+    print("Trainer process started")
+    last_version = None
+
+    while True:
+        try:
+            version = get_data_version()
+            if version != last_version:
+                publish_artifacts()
+                print(f"Trainer published artifacts for data version {version}")
+                last_version = version
+        except Exception as e:
+            print(f"Trainer error: {e}")
+            print(traceback.format_exc())
+        time.sleep(poll_interval)
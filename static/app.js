@@ -130,7 +130,7 @@ async function submitEntry(){
         document.getElementById("water").value = '';
         document.getElementById("mood").value = '';
 
-        refreshCharts();
+        syncDashboard();
     }
 
     catch (error) {
@@ -146,17 +146,80 @@ async function submitEntry(){
 
 }
 
+// Data version and entry count the dashboard currently reflects; null until the first sync
+let dataVersion = null;
+let entriesCount = null;
+
+async function syncDashboard(){
+    // The dashboard only shows charts, so ask for chart status and counts, not the history
+    const url = dataVersion === null
+        ? '/sync?include_data=false'
+        : `/sync?since=${dataVersion}&include_data=false`;
+
+    try {
+        const response = await fetch(url);
+        if (!response.ok) {
+            refreshCharts();
+            return;
+        }
+
+        const data = await response.json();
+        if (!data.changed) {
+            return;
+        }
+
+        // Entries were removed on the server (e.g. a reset), start over with a full sync
+        if (!data.full && entriesCount + data.added !== data.entries_count) {
+            dataVersion = null;
+            entriesCount = null;
+            return syncDashboard();
+        }
+
+        dataVersion = data.version;
+        entriesCount = data.entries_count;
+
+        updateChart("sleepChart", data.charts.sleep);
+        updateChart("waterChart", data.charts.water);
+        updateChart("moodChart", data.charts.mood);
+    }
+
+    catch (error) {
+        console.error('Sync failed:', error);
+        refreshCharts();
+    }
+}
+
+// Ask for the cheapest preset that still covers the image's on-screen pixels
+function chartVariant(chart){
+    const pixels = (chart.clientWidth || window.innerWidth) * (window.devicePixelRatio || 1);
+    let size = 'full';
+    if (pixels <= 480) {
+        size = 'thumb';
+    }
+    else if (pixels <= 1000) {
+        size = 'standard';
+    }
+    return `format=webp&size=${size}`;
+}
+
+function updateChart(chartId, status){
+    const chart = document.getElementById(chartId);
+    if (chart && status && status.changed) {
+        chart.src = `${status.url}&${chartVariant(chart)}`;
+    }
+}
+
 function refreshCharts(){
     const timestamp = new Date().getTime();
 
     const sleepChart = document.getElementById("sleepChart")
-    sleepChart.src = `/chart/sleep?t=${timestamp}`;
+    sleepChart.src = `/chart/sleep?t=${timestamp}&${chartVariant(sleepChart)}`;
 
     const waterChart = document.getElementById("waterChart")
-    waterChart.src = `/chart/water?t=${timestamp}`;
+    waterChart.src = `/chart/water?t=${timestamp}&${chartVariant(waterChart)}`;
 
     const moodChart = document.getElementById("moodChart")
-    moodChart.src = `/chart/mood?t=${timestamp}`;
+    moodChart.src = `/chart/mood?t=${timestamp}&${chartVariant(moodChart)}`;
 }
 
 function showError(fieldId, message) {
@@ -307,5 +370,5 @@ function validateMood(){
 
 
 window.onload = function(){
-    refreshCharts();
+    syncDashboard();
 };
\ No newline at end of file
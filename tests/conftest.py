@@ -0,0 +1,19 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# tests/test_data.py is a seeding script for habits.db, not a test module
+collect_ignore = ["test_data.py"]
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+# Must be set before config is first imported: keep the tests away from
+# habits.db and the cache the server uses
+_tmp_dir = tempfile.mkdtemp(prefix="pulse-tests-")
+atexit.register(shutil.rmtree, _tmp_dir, ignore_errors=True)
+os.environ["PULSE_DATABASE_URL"] = f"sqlite:///{_tmp_dir}/test.db"
+os.environ["PULSE_CACHE_DIR"] = str(Path(_tmp_dir) / "cache")
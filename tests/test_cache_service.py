@@ -0,0 +1,54 @@
+import pytest
+
+for module in ("numpy", "pandas", "sklearn", "matplotlib", "seaborn", "fastapi", "sqlalchemy"):
+    pytest.importorskip(module)
+
+from services import cache_service
+from services.cache_service import get_cached, set_cached
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_service, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache_service, "_current_epoch", lambda: "epoch")
+    return tmp_path / "epoch"
+
+
+def _versions(cache_dir, name):
+    return sorted(int(p.stem.rpartition("-v")[2]) for p in cache_dir.glob(f"{name}-v*.pkl"))
+
+
+def test_round_trip(cache_dir):
+    set_cached("trends", 3, {"mood": 0.5})
+    assert get_cached("trends", 3) == {"mood": 0.5}
+    assert get_cached("trends", 4) is None
+
+
+def test_prunes_only_older_versions(cache_dir):
+    for version in (1, 2, 5):
+        set_cached("trends", version, version)
+    set_cached("mood_model", 1, "model")
+
+    # A slow writer finishing version 3 must keep the newer version 5
+    set_cached("trends", 3, 3)
+
+    assert _versions(cache_dir, "trends") == [3, 5]
+    assert get_cached("trends", 5) == 5
+    assert get_cached("mood_model", 1) == "model"
+
+
+def test_prefix_match_does_not_cross_names(cache_dir):
+    set_cached("chart_sleep_3", 1, "short")
+    set_cached("chart_sleep_30", 1, "long")
+    set_cached("chart_sleep_3", 2, "short")
+
+    assert get_cached("chart_sleep_30", 1) == "long"
+
+
+def test_epochs_are_kept_apart(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_service, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache_service, "_current_epoch", lambda: "old")
+    set_cached("trends", 1, "old data")
+
+    monkeypatch.setattr(cache_service, "_current_epoch", lambda: "new")
+    assert get_cached("trends", 1) is None
@@ -1,6 +1,7 @@
 import sqlite3
 from datetime import datetime, timedelta
 import random
+import uuid
 from pathlib import Path
 
 # Compute project base directory so the script works when executed from tests/
@@ -18,13 +19,28 @@ CREATE TABLE IF NOT EXISTS habits (
     sleep_hours REAL,
     water_litres REAL,
     mood INTEGER,
-    timestamp DATETIME
+    timestamp DATETIME,
+    version INTEGER
 )
 ''')
 
+# Databases created before entries carried a data version
+columns = [row[1] for row in cursor.execute("PRAGMA table_info(habits)")]
+if "version" not in columns:
+    cursor.execute("ALTER TABLE habits ADD COLUMN version INTEGER")
+
 # Clear existing data
 cursor.execute("DELETE FROM habits")
 
+# Bump the data version so running workers drop their cached model and charts
+cursor.execute("CREATE TABLE IF NOT EXISTS data_version (id INTEGER PRIMARY KEY, version INTEGER NOT NULL, epoch VARCHAR(32))")
+if "epoch" not in [row[1] for row in cursor.execute("PRAGMA table_info(data_version)")]:
+    cursor.execute("ALTER TABLE data_version ADD COLUMN epoch VARCHAR(32)")
+cursor.execute("INSERT OR IGNORE INTO data_version (id, version, epoch) VALUES (1, 0, ?)", (uuid.uuid4().hex,))
+cursor.execute("UPDATE data_version SET epoch = ? WHERE id = 1 AND epoch IS NULL", (uuid.uuid4().hex,))
+cursor.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+version = cursor.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+
 # Create 7 days of test data
 for i in range(7):
     date = datetime.utcnow() - timedelta(days=6-i)
@@ -33,9 +49,9 @@ for i in range(7):
     mood = random.randint(3, 5)
     
     cursor.execute("""
-        INSERT INTO habits (sleep_hours, water_litres, mood, timestamp)
-        VALUES (?, ?, ?, ?)
-    """, (sleep, water, mood, date))    
+        INSERT INTO habits (sleep_hours, water_litres, mood, timestamp, version)
+        VALUES (?, ?, ?, ?, ?)
+    """, (sleep, water, mood, date, version))    
 
 conn.commit()
 conn.close()
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+for module in ("numpy", "pandas", "sklearn", "matplotlib", "seaborn", "fastapi", "sqlalchemy"):
+    pytest.importorskip(module)
+
+import numpy as np
+import pandas as pd
+
+from services import simulation_service
+from services.ml_service import FEATURE_COLUMNS
+from services.simulation_service import build_scenario_features, simulate_scenarios
+from utils.error_handlers import AppException
+
+HISTORY = {
+    'sleep_hours': np.array([5.0, 6.0, 7.0, 8.0]),
+    'water_litres': np.array([1.0, 1.5, 2.0, 2.5]),
+    'mood': np.array([2.0, 3.0, 4.0, 5.0]),
+}
+TRENDS = {'sleep_hours': 0.1, 'water_litres': -0.2, 'mood': 0.3}
+
+
+def _column(features, name):
+    return features[:, FEATURE_COLUMNS.index(name)]
+
+
+def test_features_follow_the_model_columns():
+    sleep = np.array([6.0, 9.0])
+    water = np.array([1.0, 3.0])
+    features = build_scenario_features(sleep, water, HISTORY, TRENDS, FEATURE_COLUMNS, window=3)
+
+    assert features.shape == (2, len(FEATURE_COLUMNS))
+    np.testing.assert_allclose(_column(features, 'sleep_hours'), sleep)
+    np.testing.assert_allclose(_column(features, 'water_litres'), water)
+    np.testing.assert_allclose(_column(features, 'mood_slope'), [0.3, 0.3])
+    np.testing.assert_allclose(_column(features, 'avg_mood'), [4.0, 4.0])
+
+
+@pytest.mark.parametrize("horizon_days, expected", [
+    (0, [7.0, 7.0]),                       # last three real nights only
+    (1, [(7 + 8 + 6) / 3, (7 + 8 + 9) / 3]),
+    (3, [6.0, 9.0]),                       # the scenario has filled the window
+    (10, [6.0, 9.0]),
+])
+def test_horizon_mixes_scenario_into_rolling_average(horizon_days, expected):
+    features = build_scenario_features(np.array([6.0, 9.0]), np.array([2.0, 2.0]), HISTORY, TRENDS,
+                                       FEATURE_COLUMNS, horizon_days=horizon_days, window=3)
+    np.testing.assert_allclose(_column(features, 'avg_sleep'), expected)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    start = datetime(2026, 1, 1)
+    df = pd.DataFrame({
+        'sleep_hours': HISTORY['sleep_hours'],
+        'water_litres': HISTORY['water_litres'],
+        'mood': HISTORY['mood'],
+        'timestamp': [start + timedelta(days=i) for i in range(4)],
+    })
+    monkeypatch.setattr(simulation_service, "get_data_version", lambda: 7)
+    monkeypatch.setattr(simulation_service, "load_habit_data", lambda: df.copy())
+    monkeypatch.setattr(simulation_service, "get_trained_model", lambda: (None, FEATURE_COLUMNS))
+    monkeypatch.setattr(simulation_service, "load_trends", lambda df, version: TRENDS)
+    # Encodes both inputs in the prediction so the layout can be checked
+    monkeypatch.setattr(simulation_service, "predict_mood_batch",
+                        lambda features: _column(features, 'sleep_hours') * 100 + _column(features, 'water_litres'))
+
+
+def test_grid_surface_is_sleep_by_water(fake_model):
+    sleep_values = [6.0, 7.0, 8.0]
+    water_values = [1.0, 2.0]
+    result = simulate_scenarios(sleep_values, water_values)
+
+    assert result["data_version"] == 7
+    assert len(result["scenarios"]) == 6
+    surface = np.array(result["surface"])
+    assert surface.shape == (3, 2)
+    for i, sleep in enumerate(sleep_values):
+        for j, water in enumerate(water_values):
+            assert surface[i][j] == pytest.approx(sleep * 100 + water)
+    assert [(s["sleep_hours"], s["water_litres"]) for s in result["scenarios"][:2]] == [(6.0, 1.0), (6.0, 2.0)]
+
+
+def test_explicit_pairs_have_no_surface(fake_model):
+    result = simulate_scenarios([], [], pairs=[(6.0, 2.0), (8.0, 1.0)])
+
+    assert result["surface"] is None
+    assert [s["predicted_mood"] for s in result["scenarios"]] == pytest.approx([602.0, 801.0])
+
+
+def test_oversized_grid_is_rejected_before_allocating(monkeypatch):
+    monkeypatch.setattr(simulation_service, "SIMULATION_MAX_SCENARIOS", 10)
+    with pytest.raises(AppException) as excinfo:
+        simulate_scenarios([6.0] * 4, [2.0] * 3)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from utils import single_flight as single_flight_module
+from utils.single_flight import SingleFlight
+
+WAITERS = 8
+
+
+class _CountingEvent(threading.Event):
+    waiting = 0
+    count_lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        with _CountingEvent.count_lock:
+            _CountingEvent.waiting += 1
+        return super().wait(timeout)
+
+
+class _CountingCall(single_flight_module._Call):
+    def __init__(self):
+        super().__init__()
+        self.done = _CountingEvent()
+
+
+def _run_concurrently(monkeypatch, fn):
+    monkeypatch.setattr(single_flight_module, "_Call", _CountingCall)
+    _CountingEvent.waiting = 0
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    outcomes = []
+
+    def leader_fn():
+        calls.append(1)
+        release.wait(5)
+        return fn()
+
+    def worker():
+        try:
+            outcomes.append(("result", flight.do("key", leader_fn)))
+        except Exception as e:
+            outcomes.append(("error", e))
+
+    threads = [threading.Thread(target=worker) for _ in range(WAITERS + 1)]
+    for t in threads:
+        t.start()
+    # Hold the leader until every other caller is blocked on its result
+    deadline = time.monotonic() + 5
+    while _CountingEvent.waiting < WAITERS and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    return flight, calls, outcomes
+
+
+def test_waiters_share_the_leaders_result(monkeypatch):
+    result = object()
+    flight, calls, outcomes = _run_concurrently(monkeypatch, lambda: result)
+
+    assert _CountingEvent.waiting == WAITERS
+    assert len(calls) == 1
+    assert outcomes == [("result", result)] * (WAITERS + 1)
+    assert flight._calls == {}
+
+
+def test_waiters_share_the_leaders_exception(monkeypatch):
+    error = ValueError("boom")
+
+    def fail():
+        raise error
+
+    flight, calls, outcomes = _run_concurrently(monkeypatch, fail)
+
+    assert len(calls) == 1
+    assert outcomes == [("error", error)] * (WAITERS + 1)
+    assert flight._calls == {}
+
+
+def test_completed_calls_are_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do("key", fn) == 1
+    assert flight.do("key", fn) == 2
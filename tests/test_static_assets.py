@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from utils import static_assets
+from utils.static_assets import negotiate_asset, parse_accept_encoding
+
+ASSET = "app.0123456789ab.js"
+
+
+@pytest.fixture
+def asset(monkeypatch):
+    bodies = {"identity": b"plain", "gzip": b"gzipped", "br": b"brotli"}
+    monkeypatch.setitem(static_assets._assets, ASSET, {
+        "media_type": "application/javascript",
+        "bodies": bodies
+    })
+    return bodies
+
+
+def test_parse_accept_encoding_reads_q_values():
+    assert parse_accept_encoding("br;q=0, gzip") == {"br": 0.0, "gzip": 1.0}
+    assert parse_accept_encoding("gzip;q=0.5, br;q=0.8") == {"gzip": 0.5, "br": 0.8}
+    assert parse_accept_encoding("GZIP; q=bad") == {"gzip": 0.0}
+    assert parse_accept_encoding("") == {}
+
+
+def test_q_zero_refuses_an_encoding(asset):
+    assert negotiate_asset(ASSET, "br;q=0, gzip") == (b"gzipped", "application/javascript", "gzip")
+
+
+def test_wildcard_prefers_brotli(asset):
+    assert negotiate_asset(ASSET, "*") == (b"brotli", "application/javascript", "br")
+
+
+def test_wildcard_without_brotli_falls_back_to_gzip(asset):
+    del asset["br"]
+    assert negotiate_asset(ASSET, "*") == (b"gzipped", "application/javascript", "gzip")
+
+
+def test_higher_q_value_wins(asset):
+    assert negotiate_asset(ASSET, "br;q=0.5, gzip;q=0.9")[2] == "gzip"
+
+
+def test_nothing_acceptable_serves_identity(asset):
+    assert negotiate_asset(ASSET, "*;q=0") == (b"plain", "application/javascript", None)
+    assert negotiate_asset(ASSET, "") == (b"plain", "application/javascript", None)
+
+
+def test_unknown_asset():
+    assert negotiate_asset("missing.js", "gzip") is None
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+for module in ("numpy", "pandas", "sklearn", "matplotlib", "seaborn", "fastapi", "sqlalchemy"):
+    pytest.importorskip(module)
+
+import pandas as pd
+
+from database import init_db, get_db, bump_data_version, HabitDB
+from services import sync_service
+from services.sync_service import build_sync
+
+
+def _add_entries(db, moods, version):
+    start = datetime(2026, 1, 1)
+    for mood in moods:
+        db.add(HabitDB(sleep_hours=7.0, water_litres=2.0, mood=mood,
+                       timestamp=start + timedelta(days=mood), version=version))
+
+
+@pytest.fixture
+def history(monkeypatch):
+    # Entry bookkeeping only; trends and forecasts are covered elsewhere
+    monkeypatch.setattr(sync_service, "load_habit_data", lambda: pd.DataFrame())
+    monkeypatch.setattr(sync_service, "load_trends",
+                        lambda df, version: {'sleep_hours': 0, 'water_litres': 0, 'mood': 0})
+
+    init_db()
+    with get_db() as db:
+        db.query(HabitDB).delete()
+        _add_entries(db, [1], None)  # logged before entries carried a version
+        first = bump_data_version(db)
+        _add_entries(db, [2, 3], first)
+        db.commit()
+        second = bump_data_version(db)
+        _add_entries(db, [4], second)
+        db.commit()
+    return first, second
+
+
+def test_full_sync_returns_every_entry(history):
+    _, second = history
+    result = build_sync()
+
+    assert result["version"] == second
+    assert result["full"] and result["changed"]
+    assert [e["mood"] for e in result["entries"]] == [1, 2, 3, 4]
+    assert result["added"] == result["entries_count"] == 4
+    assert result["trends"] is not None
+
+
+def test_delta_sync_returns_only_newer_entries(history):
+    first, second = history
+    result = build_sync(since=first)
+
+    assert not result["full"] and result["changed"]
+    assert [(e["mood"], e["version"]) for e in result["entries"]] == [(4, second)]
+    assert result["added"] == 1
+    assert result["entries_count"] == 4
+    assert all(chart["url"].endswith(f"?v={second}") for chart in result["charts"].values())
+
+
+def test_up_to_date_client_gets_nothing(history):
+    _, second = history
+    result = build_sync(since=second)
+
+    assert not result["full"] and not result["changed"]
+    assert result["entries"] == []
+    assert result["added"] == 0
+    assert result["trends"] is None
+    assert not any(chart["changed"] for chart in result["charts"].values())
+
+
+def test_client_ahead_of_server_starts_over(history):
+    _, second = history
+    result = build_sync(since=second + 5)
+
+    assert result["full"]
+    assert len(result["entries"]) == 4
+
+
+def test_counts_only_without_data(history):
+    first, _ = history
+    result = build_sync(since=first, include_data=False)
+
+    assert result["entries"] == []
+    assert result["added"] == 1
+    assert result["entries_count"] == 4
+    assert result["trends"] is None and result["forecast"] is None
@@ -0,0 +1,88 @@
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+# Allow running as `python tools/bench_charts.py` from the project root
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from config import CHART_PRESETS, MODEL_WINDOW_SIZE
+from services.chart_service import build_habit_figure, save_figure, CHART_MEDIA_TYPES
+from services.data_service import compute_trends
+from services.ml_service import build_training_frame, build_model, forecast_habit, FEATURE_COLUMNS
+
+CHARTS = [
+    ('sleep_hours', 'Sleep Hours Over Time'),
+    ('mood', 'Mood Over Time'),
+]
+
+
+def synthetic_history(days: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    start = datetime.utcnow() - timedelta(days=days)
+    return pd.DataFrame({
+        'timestamp': [start + timedelta(days=i) for i in range(days)],
+        'sleep_hours': np.round(7 + rng.uniform(-1.5, 1.5, days), 1),
+        'water_litres': np.round(2 + rng.uniform(-0.8, 0.8, days), 1),
+        'mood': rng.integers(2, 6, days),
+    })
+
+
+def train_model(df: pd.DataFrame):
+    frame = build_training_frame(df, MODEL_WINDOW_SIZE)
+    model = build_model()
+    model.fit(frame[FEATURE_COLUMNS], frame['mood'])
+    return model, list(FEATURE_COLUMNS)
+
+
+def median_ms(timings: list) -> float:
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart render time and size per format and preset")
+    parser.add_argument("--days", type=int, default=60, help="Days of synthetic history to plot")
+    parser.add_argument("--repeat", type=int, default=5, help="Renders per variant")
+    args = parser.parse_args()
+
+    df = synthetic_history(args.days)
+    trends = compute_trends(df)
+    model_data = train_model(df)
+
+    print(f"{'chart':<13}{'format':<8}{'size':<10}{'forecast ms':>13}{'draw ms':>10}{'savefig ms':>12}{'bytes':>10}")
+    for habit_column, title in CHARTS:
+        # The mood forecast runs the model; render_habit_chart pays this outside the render lock
+        forecast_timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            future_dates, future_values = forecast_habit(df, habit_column, 3,
+                                                         model_data if habit_column == "mood" else None, trends)
+            forecast_timings.append(time.perf_counter() - start)
+
+        for fmt in CHART_MEDIA_TYPES:
+            for size, preset in CHART_PRESETS.items():
+                draw_timings = []
+                save_timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    fig = build_habit_figure(df, habit_column, title, future_dates, future_values, preset)
+                    drawn = time.perf_counter()
+                    # savefig rasterises and encodes; formats and presets differ mostly here
+                    buf = save_figure(fig, fmt, preset)
+                    draw_timings.append(drawn - start)
+                    save_timings.append(time.perf_counter() - drawn)
+                print(f"{habit_column:<13}{fmt:<8}{size:<10}{median_ms(forecast_timings):>13.1f}"
+                      f"{median_ms(draw_timings):>10.1f}{median_ms(save_timings):>12.1f}{len(buf.getvalue()):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Allow running as `python tools/load_test.py` from the project root
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+DEFAULT_MIX = "add_entry=1,entries=3,chart=3,health=1"
+CHART_ROUTES = ["/chart/sleep", "/chart/water", "/chart/mood"]
+SEED_RANDOM_STATE = 42
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("add_entry", "entries", "chart", "health"):
+            raise ValueError(f"Unknown route in mix: {name}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Route mix must have a positive total weight")
+    return mix
+
+
+def build_request(kind: str) -> Tuple[str, str, str, Optional[bytes]]:
+    if kind == "add_entry":
+        body = json.dumps({
+            "sleep_hours": round(random.uniform(5, 9), 1),
+            "water_litres": round(random.uniform(1, 3.5), 1),
+            "mood": random.randint(1, 5)
+        }).encode()
+        return "/add_entry", "POST", "/add_entry", body
+    if kind == "chart":
+        path = random.choice(CHART_ROUTES)
+        return path, "GET", path, None
+    path = f"/{kind}"
+    return path, "GET", path, None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+async def call_asgi(app, method: str, target: str, body: Optional[bytes]) -> int:
+    path, _, query = target.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"loadtest"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("loadtest", 80),
+    }
+    pending = [{"type": "http.request", "body": body or b"", "more_body": False}]
+    status = {"code": 0}
+    response_done = asyncio.Event()
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        # Like a real client, stay connected until the response is complete;
+        # StreamingResponse stops sending as soon as it sees a disconnect
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_done.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        response_done.set()
+    return status["code"]
+
+
+def call_http(base_url: str, method: str, target: str, body: Optional[bytes]) -> int:
+    req = urllib.request.Request(base_url.rstrip("/") + target, data=body, method=method,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+async def run_load(mix: Dict[str, float], rate: float, duration: float,
+                   app=None, base_url: Optional[str] = None) -> Tuple[dict, float]:
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+
+    async def one(kind: str, scheduled: float):
+        route, method, target, body = build_request(kind)
+        try:
+            if app is not None:
+                code = await call_asgi(app, method, target, body)
+            else:
+                code = await asyncio.to_thread(call_http, base_url, method, target, body)
+        except Exception as e:
+            print(f"Request to {route} failed: {e}")
+            code = 0
+        # Measured from the scheduled send time, not when the task got to run:
+        # in process, blocking handlers also delay this loop, and that wait is
+        # part of what a real client would see (avoids coordinated omission)
+        samples[route].append((time.perf_counter() - scheduled) * 1000)
+        if code >= 400 or code == 0:
+            errors[route] += 1
+
+    # Open-loop schedule: request i is due at started + i / rate regardless of how
+    # long earlier ones take, and its latency counts from that due time
+    tasks = []
+    started = time.perf_counter()
+    total = int(rate * duration)
+    for i in range(total):
+        scheduled = started + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        kind = random.choices(kinds, weights)[0]
+        tasks.append(asyncio.create_task(one(kind, scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    for route, latencies in sorted(samples.items()):
+        report[route] = {
+            "count": len(latencies),
+            "errors": errors[route],
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        }
+    return report, elapsed
+
+
+def print_report(report: dict, elapsed: float):
+    total = sum(r["count"] for r in report.values())
+    print(f"\n{total} requests in {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+    print(f"{'route':<16}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, r in report.items():
+        print(f"{route:<16}{r['count']:>8}{r['errors']:>8}"
+              f"{r['p50']:>10.1f}{r['p95']:>10.1f}{r['p99']:>10.1f}")
+
+
+def check_budget(report: dict, budget: dict) -> List[str]:
+    failures = []
+    for route, limits in budget.items():
+        if route not in report:
+            continue
+        for key in ("p95", "p99"):
+            if key in limits and report[route][key] > limits[key]:
+                failures.append(f"{route} {key} {report[route][key]:.1f}ms > budget {limits[key]:.1f}ms")
+        if report[route]["errors"]:
+            failures.append(f"{route} returned {report[route]['errors']} errors")
+    return failures
+
+
+def seed_entries(count: int):
+    from datetime import datetime, timedelta
+    from database import get_db, bump_data_version, HabitDB
+
+    # Every run starts from the same history, so --check compares like with like
+    rng = random.Random(SEED_RANDOM_STATE)
+    with get_db() as db:
+        db.query(HabitDB).delete()
+        version = bump_data_version(db)
+        for i in range(count):
+            db.add(HabitDB(
+                sleep_hours=round(7 + rng.uniform(-1.5, 1.5), 1),
+                water_litres=round(2 + rng.uniform(-0.8, 0.8), 1),
+                mood=rng.randint(2, 5),
+                timestamp=datetime.utcnow() - timedelta(days=count - i),
+                version=version
+            ))
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Pulse AI Coach API")
+    parser.add_argument("--url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--rate", type=float, default=20, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=15, help="Test duration in seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Route weights, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--database", default="sqlite:///loadtest.db",
+                        help="Database URL for in-process runs (kept apart from habits.db)")
+    parser.add_argument("--seed", type=int, default=30,
+                        help="Replace the load-test data with this many entries before an in-process run (0 keeps it)")
+    parser.add_argument("--budget", help="Latency budget file (defaults to LOAD_TEST_BUDGET_PATH)")
+    parser.add_argument("--check", action="store_true", help="Fail if p95/p99 exceed the budget")
+    parser.add_argument("--write-budget", action="store_true",
+                        help="Store this run's tail latencies (with headroom) as the budget")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    app = None
+    if not args.url:
+        # Must be set before config is first imported. Seeding wipes the cache,
+        # so never inherit PULSE_CACHE_DIR from a shell that serves habits.db
+        os.environ["PULSE_DATABASE_URL"] = args.database
+        os.environ["PULSE_CACHE_DIR"] = str(BASE_DIR / ".cache-loadtest")
+
+    from config import LOAD_TEST_BUDGET_PATH, LOAD_TEST_BUDGET_HEADROOM
+
+    if not args.url:
+        import main as app_module
+        from database import init_db
+
+        init_db()
+        if args.seed:
+            from config import CACHE_DIR
+
+            shutil.rmtree(CACHE_DIR, ignore_errors=True)
+            seed_entries(args.seed)
+        app = app_module.app
+
+    print(f"Running {args.rate:g} req/s for {args.duration:g}s against "
+          f"{args.url or 'in-process app'} with mix {mix}")
+    report, elapsed = asyncio.run(run_load(mix, args.rate, args.duration, app=app, base_url=args.url))
+    print_report(report, elapsed)
+
+    budget_path = Path(args.budget) if args.budget else LOAD_TEST_BUDGET_PATH
+    if args.write_budget:
+        budget = {
+            route: {key: round(r[key] * LOAD_TEST_BUDGET_HEADROOM, 1) for key in ("p95", "p99")}
+            for route, r in report.items()
+        }
+        budget_path.write_text(json.dumps(budget, indent=2))
+        print(f"Budget written to {budget_path}")
+
+    if args.check:
+        if not budget_path.exists():
+            print(f"No budget found at {budget_path}, run with --write-budget first")
+            sys.exit(2)
+        failures = check_budget(report, json.loads(budget_path.read_text()))
+        if failures:
+            print("LATENCY BUDGET EXCEEDED:")
+            for f in failures:
+                print(f"  {f}")
+            sys.exit(1)
+        print("Latency budget OK")
+
+
+if __name__ == "__main__":
+    main()
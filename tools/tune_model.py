@@ -0,0 +1,141 @@
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Allow running as `python tools/tune_model.py` from the project root
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from config import MODEL_PARAMS_PATH, MODEL_WINDOW_SIZE, CACHE_DIR
+from services.data_service import load_habit_data, compute_trends
+from services.ml_service import build_training_frame, build_model, FEATURE_COLUMNS
+
+ESTIMATOR_GRID = [10, 20, 50, 100]
+MAX_DEPTH_GRID = [4, 6, 10, None]
+MIN_SAMPLES_SPLIT_GRID = [2, 5, 10]
+PREDICT_REPEATS = 50
+
+
+def walk_forward_splits(n_rows: int, min_train: int, horizon: int, step: int) -> List[tuple]:
+    # Expanding window: train on everything before t, score the next `horizon` rows
+    splits = []
+    for t in range(min_train, n_rows, step):
+        splits.append((t, min(t + horizon, n_rows)))
+    return splits
+
+
+def build_folds(history: pd.DataFrame, splits: List[tuple], window: int = MODEL_WINDOW_SIZE) -> List[tuple]:
+    history = history.sort_values("timestamp").reset_index(drop=True)
+    folds = []
+    for train_end, test_end in splits:
+        # Slopes come from the training rows only, like the served model, which
+        # never sees the days it forecasts
+        trends = compute_trends(history.iloc[:train_end], window=window)
+        frame = build_training_frame(history.iloc[:test_end], window, trends)
+        train = frame[frame.index < train_end]
+        test = frame[frame.index >= train_end]
+        if train.empty or test.empty:
+            continue
+        folds.append((
+            train[FEATURE_COLUMNS].to_numpy(), train["mood"].to_numpy(dtype=float),
+            test[FEATURE_COLUMNS].to_numpy(), test["mood"].to_numpy(dtype=float),
+        ))
+    return folds
+
+
+def backtest(params: Dict, folds: List[tuple]) -> Dict:
+    errors = []
+    fit_times = []
+    model = None
+
+    for x_train, y_train, x_test, y_test in folds:
+        model = build_model(n_jobs=1, **params)
+        start = time.perf_counter()
+        model.fit(x_train, y_train)
+        fit_times.append(time.perf_counter() - start)
+        preds = model.predict(x_test)
+        errors.extend(np.abs(preds - y_test))
+
+    # Single-row latency is what /add_entry and the mood chart pay per call
+    row = folds[-1][2][-1:]
+    start = time.perf_counter()
+    for _ in range(PREDICT_REPEATS):
+        model.predict(row)
+    predict_ms = (time.perf_counter() - start) * 1000 / PREDICT_REPEATS
+
+    errors = np.array(errors)
+    return {
+        "params": params,
+        "mae": float(errors.mean()),
+        "within_half": float((errors <= 0.5).mean()),
+        "fit_ms": float(np.mean(fit_times) * 1000),
+        "predict_ms": predict_ms,
+    }
+
+
+def choose(results: List[Dict], tolerance: float) -> Dict:
+    # Cheapest model whose error is within `tolerance` of the best one
+    best_mae = min(r["mae"] for r in results)
+    candidates = [r for r in results if r["mae"] <= best_mae * (1 + tolerance)]
+    return min(candidates, key=lambda r: (r["predict_ms"], r["fit_ms"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward grid search for the mood model")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Parallel worker processes")
+    parser.add_argument("--min-train", type=int, default=10, help="Entries in the first training fold")
+    parser.add_argument("--horizon", type=int, default=3, help="Entries scored after each fold")
+    parser.add_argument("--step", type=int, default=3, help="Entries added between folds")
+    parser.add_argument("--tolerance", type=float, default=0.02,
+                        help="Accept models whose MAE is within this fraction of the best")
+    parser.add_argument("--write", action="store_true", help=f"Write the chosen settings to {MODEL_PARAMS_PATH.name}")
+    args = parser.parse_args()
+
+    history = load_habit_data()
+    splits = walk_forward_splits(len(history), args.min_train, args.horizon, args.step)
+    folds = build_folds(history, splits)
+    if not folds:
+        print(f"Not enough data to backtest: have {len(history)} entries, need more than "
+              f"{max(args.min_train, MODEL_WINDOW_SIZE + 1)}")
+        sys.exit(1)
+
+    grid = [
+        {"n_estimators": n, "max_depth": d, "min_samples_split": m}
+        for n, d, m in itertools.product(ESTIMATOR_GRID, MAX_DEPTH_GRID, MIN_SAMPLES_SPLIT_GRID)
+    ]
+
+    print(f"Backtesting {len(grid)} settings over {len(folds)} folds on {args.jobs} processes")
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(backtest, grid, itertools.repeat(folds)))
+    print(f"Search finished in {time.perf_counter() - started:.1f}s\n")
+
+    results.sort(key=lambda r: r["mae"])
+    print(f"{'trees':>6}{'depth':>7}{'split':>7}{'MAE':>8}{'<=0.5':>8}{'fit ms':>9}{'pred ms':>9}")
+    for r in results:
+        p = r["params"]
+        print(f"{p['n_estimators']:>6}{str(p['max_depth']):>7}{p['min_samples_split']:>7}"
+              f"{r['mae']:>8.3f}{r['within_half']:>8.2f}{r['fit_ms']:>9.1f}{r['predict_ms']:>9.2f}")
+
+    chosen = choose(results, args.tolerance)
+    print(f"\nChosen: {chosen['params']} (MAE {chosen['mae']:.3f}, predict {chosen['predict_ms']:.2f}ms)")
+
+    if args.write:
+        MODEL_PARAMS_PATH.write_text(json.dumps(chosen["params"], indent=2))
+        # Cached models and charts were built with the old settings
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        print(f"Settings written to {MODEL_PARAMS_PATH}; restart the server to apply them")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,4 @@
-from . import error_handlers
\ No newline at end of file
+from . import error_handlers
+from . import single_flight
+from . import static_assets
+from . import compression
\ No newline at end of file
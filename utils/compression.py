@@ -0,0 +1,17 @@
+from fastapi.middleware.gzip import GZipMiddleware
+
+class JSONCompressionMiddleware:
+    # Gzip (when the client accepts it) only for the listed JSON endpoints;
+    # chart images are already compressed and fingerprinted assets are
+    # pre-compressed, so running them through gzip again only costs CPU
+
+    def __init__(self, app, paths: list, minimum_size: int = 1000):
+        self.app = app
+        self.paths = set(paths)
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
@@ -0,0 +1,90 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from config import STATIC_DIR, FINGERPRINTED_ASSETS, ASSET_URL_PREFIX
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Built once at startup: hashed name -> {media_type, identity/gzip/br bodies}
+_assets: Dict[str, dict] = {}
+_index_html: Dict[str, Optional[str]] = {"html": None}
+
+def build_static_assets():
+    _assets.clear()
+    urls = {}
+
+    for name in FINGERPRINTED_ASSETS:
+        path = STATIC_DIR / name
+        if not path.exists():
+            print(f"Static asset {name} not found, serving it unhashed")
+            continue
+
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        stem, dot, ext = name.rpartition(".")
+        hashed_name = f"{stem}.{digest}.{ext}"
+
+        bodies = {"identity": content, "gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            bodies["br"] = brotli.compress(content, quality=11)
+
+        _assets[hashed_name] = {
+            "media_type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "bodies": bodies
+        }
+        urls[name] = f"{ASSET_URL_PREFIX}/{hashed_name}"
+
+    index_path = STATIC_DIR / "index.html"
+    if index_path.exists():
+        html = index_path.read_text(encoding="utf-8")
+        for name, url in urls.items():
+            # Drops any hand-written ?v= cache buster along with the old path
+            html = re.sub(rf'/static/{re.escape(name)}(\?[^"\']*)?', url, html)
+        _index_html["html"] = html
+
+    print(f"Fingerprinted {len(_assets)} static assets"
+          f"{'' if brotli is not None else ' (brotli not installed, gzip only)'}")
+
+def get_index_html() -> Optional[str]:
+    return _index_html["html"]
+
+def negotiate_asset(hashed_name: str, accept_encoding: str) -> Optional[tuple]:
+    asset = _assets.get(hashed_name)
+    if asset is None:
+        return None
+
+    weights = parse_accept_encoding(accept_encoding)
+    # Highest q-value wins; on a tie prefer br over gzip. q=0 means "not acceptable"
+    best = None
+    for encoding in ("br", "gzip"):
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0 and encoding in asset["bodies"] and (best is None or q > best[0]):
+            best = (q, encoding)
+    if best is not None:
+        return asset["bodies"][best[1]], asset["media_type"], best[1]
+    return asset["bodies"]["identity"], asset["media_type"], None
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    weights = {}
+    for part in header.lower().split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights